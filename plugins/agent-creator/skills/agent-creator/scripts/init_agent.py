@@ -17,18 +17,21 @@ Examples:
     python init_agent.py quick-search --pattern quick
 """
 
-import argparse
+import functools
 import os
-import re
 import sys
 from pathlib import Path
+from types import MappingProxyType
+from typing import Final, Mapping, Optional
 
-# Agent templates by pattern
-TEMPLATES = {
-    "researcher": {
-        "tools": ["Read", "Grep", "Glob", "WebSearch", "WebFetch"],
-        "model": "sonnet",
-        "prompt": '''You are a research specialist focused on finding and analyzing information.
+# Default directory for new agents (user-level agents)
+_DEFAULT_AGENT_DIR = Path.home() / ".claude" / "agents"
+
+# Valid agent names: lowercase letter first, then lowercase, digits, hyphens
+_NAME_BYTES = b"abcdefghijklmnopqrstuvwxyz0123456789-"
+
+# System prompts by pattern
+_RESEARCHER_PROMPT: Final[str] = '''You are a research specialist focused on finding and analyzing information.
 
 ## Capabilities
 
@@ -51,12 +54,8 @@ Provide findings with:
 2. Supporting evidence with file paths or URLs
 3. Confidence level for conclusions
 4. Suggestions for further investigation if needed'''
-    },
 
-    "reviewer": {
-        "tools": ["Read", "Grep", "Glob", "Bash"],
-        "model": "sonnet",
-        "prompt": '''You are a senior software engineer specializing in code review.
+_REVIEWER_PROMPT: Final[str] = '''You are a senior software engineer specializing in code review.
 
 ## Review Focus Areas
 
@@ -87,12 +86,8 @@ For each issue found:
 - Be specific with line numbers and code references
 - Explain *why* something is an issue, not just *what*
 - Prioritize security and correctness over style'''
-    },
 
-    "specialist": {
-        "tools": ["Read", "Write", "Edit", "Grep", "Glob", "Bash"],
-        "model": "sonnet",
-        "prompt": '''You are a specialist in [DOMAIN].
+_SPECIALIST_PROMPT: Final[str] = '''You are a specialist in [DOMAIN].
 
 ## Expertise
 
@@ -108,12 +103,8 @@ For each issue found:
 - Test changes appropriately
 
 Avoid over-engineering. Only make changes directly requested or clearly necessary.'''
-    },
 
-    "builder": {
-        "tools": ["Read", "Write", "Edit", "Grep", "Glob", "Bash", "TodoWrite"],
-        "model": "sonnet",
-        "prompt": '''You are an implementation specialist focused on writing quality code.
+_BUILDER_PROMPT: Final[str] = '''You are an implementation specialist focused on writing quality code.
 
 ## Approach
 
@@ -140,12 +131,8 @@ Do not:
 - Write clear, self-documenting code
 - Handle errors at system boundaries
 - Use TypeScript types appropriately'''
-    },
 
-    "quick": {
-        "tools": ["Read", "Grep", "Glob"],
-        "model": "haiku",
-        "prompt": '''You are a fast, efficient assistant for quick tasks.
+_QUICK_PROMPT: Final[str] = '''You are a fast, efficient assistant for quick tasks.
 
 ## Focus
 
@@ -155,12 +142,8 @@ Do not:
 - No over-explanation
 
 Keep responses brief. Get to the point immediately.'''
-    },
 
-    "orchestrator": {
-        "tools": ["Read", "Grep", "Glob", "Task", "TodoWrite"],
-        "model": "opus",
-        "prompt": '''You are a technical coordinator who accomplishes complex tasks by delegating to specialized sub-agents.
+_ORCHESTRATOR_PROMPT: Final[str] = '''You are a technical coordinator who accomplishes complex tasks by delegating to specialized sub-agents.
 
 ## Coordination Strategy
 
@@ -177,12 +160,8 @@ Keep responses brief. Get to the point immediately.'''
 - Run independent sub-agents in parallel
 - Verify sub-agent results before proceeding
 - Maintain overall coherence across sub-tasks'''
-    },
 
-    "planner": {
-        "tools": ["Read", "Grep", "Glob", "WebSearch"],
-        "model": "opus",
-        "prompt": '''You are a software architect focused on design and planning.
+_PLANNER_PROMPT: Final[str] = '''You are a software architect focused on design and planning.
 
 ## Responsibilities
 
@@ -214,63 +193,223 @@ Plans should include:
 - Do not implement, only plan
 - Consider maintainability and scalability
 - Identify dependencies between steps'''
-    }
-}
+
+# Agent templates by pattern; the table and its entries are read-only so the
+# renderings cached by _get_template can never go stale
+TEMPLATES = MappingProxyType({
+    "researcher": MappingProxyType({
+        "tools": ("Read", "Grep", "Glob", "WebSearch", "WebFetch"),
+        "model": "sonnet",
+        "prompt": _RESEARCHER_PROMPT,
+    }),
+    "reviewer": MappingProxyType({
+        "tools": ("Read", "Grep", "Glob", "Bash"),
+        "model": "sonnet",
+        "prompt": _REVIEWER_PROMPT,
+    }),
+    "specialist": MappingProxyType({
+        "tools": ("Read", "Write", "Edit", "Grep", "Glob", "Bash"),
+        "model": "sonnet",
+        "prompt": _SPECIALIST_PROMPT,
+    }),
+    "builder": MappingProxyType({
+        "tools": ("Read", "Write", "Edit", "Grep", "Glob", "Bash", "TodoWrite"),
+        "model": "sonnet",
+        "prompt": _BUILDER_PROMPT,
+    }),
+    "quick": MappingProxyType({
+        "tools": ("Read", "Grep", "Glob"),
+        "model": "haiku",
+        "prompt": _QUICK_PROMPT,
+    }),
+    "orchestrator": MappingProxyType({
+        "tools": ("Read", "Grep", "Glob", "Task", "TodoWrite"),
+        "model": "opus",
+        "prompt": _ORCHESTRATOR_PROMPT,
+    }),
+    "planner": MappingProxyType({
+        "tools": ("Read", "Grep", "Glob", "WebSearch"),
+        "model": "opus",
+        "prompt": _PLANNER_PROMPT,
+    })
+})
+
+# Pattern names as listed in error messages
+_PATTERN_LIST = ", ".join(TEMPLATES)
+_PATTERN_CHOICES = ", ".join(repr(pattern) for pattern in TEMPLATES)
+
+# Absolute paths of directories already created or confirmed by this process
+_ensured_dirs = set()
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create path (and parents) unless this process already ensured it."""
+    key = os.path.abspath(path)
+    if key in _ensured_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(key)
+
+
+@functools.cache
+def _get_template(pattern: str) -> Optional[Mapping]:
+    """Render and encode a pattern's agent file once, on first use.
+
+    The file is split around the agent name so create_agent only has to
+    splice it in. Prompt whitespace is normalized here too, so the file always
+    ends with exactly one newline after the prompt. Returns None for an
+    unknown pattern.
+    """
+    template = TEMPLATES.get(pattern)
+    if template is None:
+        return None
+
+    template = dict(template)
+    template["prompt"] = template["prompt"].strip()
+    template["tools_yaml"] = "\n".join(f"  - {tool}" for tool in template["tools"])
+    template["prefix_bytes"] = b"---\nname: "
+    template["suffix_bytes"] = (
+        '\ndescription: "TODO: Describe when to use this agent"\n'
+        f'tools:\n{template["tools_yaml"]}\n'
+        f'model: {template["model"]}\n'
+        f'---\n\n{template["prompt"]}\n'
+    ).encode("utf-8")
+    return MappingProxyType(template)
 
 
 def validate_name(name: str) -> bool:
     """Validate agent name is lowercase with hyphens only."""
-    return bool(re.match(r'^[a-z][a-z0-9-]*$', name))
+    # Deleting every allowed byte leaves nothing behind only for a valid name;
+    # non-ASCII characters encode to "?" and so always survive
+    return (
+        bool(name)
+        and "a" <= name[0] <= "z"
+        and not name.encode("ascii", "replace").translate(None, _NAME_BYTES)
+    )
 
 
-def create_agent(name: str, path: Path, pattern: str) -> Path:
-    """Create a new agent file from template."""
-
+def _resolve_template(name: str, pattern: str) -> Mapping:
+    """Validate name and pattern, returning the rendered template."""
     if not validate_name(name):
         print(f"Error: Agent name must be lowercase with hyphens only (got: {name})")
         sys.exit(1)
 
-    if pattern not in TEMPLATES:
+    template = _get_template(pattern)
+    if template is None:
         print(f"Error: Unknown pattern '{pattern}'")
-        print(f"Available patterns: {', '.join(TEMPLATES.keys())}")
+        print(f"Available patterns: {_PATTERN_LIST}")
         sys.exit(1)
 
-    template = TEMPLATES[pattern]
+    return template
 
-    # Ensure directory exists
-    path.mkdir(parents=True, exist_ok=True)
 
-    # Create agent file
-    agent_file = path / f"{name}.md"
-
-    if agent_file.exists():
+def _open_new_file(agent_file: Path) -> int:
+    """Create agent_file exclusively, exiting if it already exists."""
+    # O_EXCL makes the existence check and creation a single atomic open
+    try:
+        return os.open(agent_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
         print(f"Error: Agent file already exists: {agent_file}")
         sys.exit(1)
 
-    # Build YAML frontmatter
-    tools_yaml = "\n".join(f"  - {tool}" for tool in template["tools"])
-
-    content = f'''---
-name: {name}
-description: "TODO: Describe when to use this agent"
-tools:
-{tools_yaml}
-model: {template["model"]}
----
 
-{template["prompt"]}
-'''
+def _write_agent(name: str, path: Path, template: Mapping) -> Path:
+    """Write the agent file into an existing directory."""
+    agent_file = path / f"{name}.md"
 
-    agent_file.write_text(content)
+    try:
+        fd = _open_new_file(agent_file)
+    except FileNotFoundError:
+        # The directory vanished after _ensure_dir cached it; recreate once
+        _ensured_dirs.discard(os.path.abspath(path))
+        _ensure_dir(path)
+        fd = _open_new_file(agent_file)
+
+    # Name is ASCII-only once validated. Write straight to the descriptor with
+    # no file object; a small file normally goes out in a single write()
+    data = memoryview(
+        template["prefix_bytes"] + name.encode("ascii") + template["suffix_bytes"]
+    )
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    except BaseException:
+        # Don't leave a partial file behind to block a retry
+        os.close(fd)
+        agent_file.unlink(missing_ok=True)
+        raise
+    os.close(fd)
 
     return agent_file
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Initialize a new Claude Code agent",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+def create_agent(name: str, path: Path, pattern: str) -> Path:
+    """Create a new agent file from template."""
+    template = _resolve_template(name, pattern)
+
+    # Ensure directory exists
+    _ensure_dir(path)
+
+    return _write_agent(name, path, template)
+
+
+def create_agents(specs: list[tuple[str, Path, str]]) -> list[Path]:
+    """Create several agent files from (name, path, pattern) specs.
+
+    Every spec is checked before anything is written: names, patterns,
+    duplicate targets within the batch and files that already exist. Each
+    distinct directory is created once. If a write still fails, the files
+    this call already created are removed, so the batch is all or nothing.
+    """
+    templates = [_resolve_template(name, pattern) for name, _, pattern in specs]
+
+    targets = set()
+    for name, path, _ in specs:
+        agent_file = path / f"{name}.md"
+        target = os.path.abspath(agent_file)
+        if target in targets:
+            print(f"Error: Duplicate agent in batch: {agent_file}")
+            sys.exit(1)
+        if os.path.lexists(target):
+            print(f"Error: Agent file already exists: {agent_file}")
+            sys.exit(1)
+        targets.add(target)
+
+    for path in dict.fromkeys(path for _, path, _ in specs):
+        _ensure_dir(path)
+
+    created = []
+    try:
+        for (name, path, _), template in zip(specs, templates):
+            created.append(_write_agent(name, path, template))
+    except BaseException:
+        # Includes the SystemExit raised when a file appeared after the checks
+        for agent_file in created:
+            agent_file.unlink(missing_ok=True)
+        raise
+
+    return created
+
+
+# Pattern choices as argparse shows them in usage and help
+_PATTERN_METAVAR = "{" + ",".join(TEMPLATES) + "}"
+
+_LONG_OPTIONS = ("--help", "--path", "--pattern")
+
+# Static help body; only the usage line depends on the program name
+_HELP_BODY = f"""
+Initialize a new Claude Code agent
+
+positional arguments:
+  name                  Agent name (lowercase, hyphens only)
+
+options:
+  -h, --help            show this help message and exit
+  --path PATH           Directory to create agent in (default:
+                        ~/.claude/agents/)
+  --pattern {_PATTERN_METAVAR}
+                        Agent pattern to use (default: specialist)
+
 Patterns:
   researcher    Read-only exploration and information gathering
   reviewer      Code review without editing capability
@@ -279,29 +418,115 @@ Patterns:
   quick         Fast responses using Haiku
   orchestrator  Coordinates sub-agents for complex tasks
   planner       Architecture and design without implementation
-        """
-    )
+"""
 
-    parser.add_argument("name", help="Agent name (lowercase, hyphens only)")
-    parser.add_argument(
-        "--path",
-        type=Path,
-        default=Path.home() / ".claude" / "agents",
-        help="Directory to create agent in (default: ~/.claude/agents/)"
-    )
-    parser.add_argument(
-        "--pattern",
-        choices=list(TEMPLATES.keys()),
-        default="specialist",
-        help="Agent pattern to use (default: specialist)"
+
+def _format_usage(prog: str) -> str:
+    """Return the usage line, wrapped the way argparse wraps it."""
+    indent = " " * len(f"usage: {prog} ")
+    return (
+        f"usage: {prog} [-h] [--path PATH]\n"
+        f"{indent}[--pattern {_PATTERN_METAVAR}]\n"
+        f"{indent}name\n"
     )
 
-    args = parser.parse_args()
 
-    agent_file = create_agent(args.name, args.path, args.pattern)
+def _usage_error(prog: str, message: str) -> None:
+    """Print usage and an argparse-style error to stderr, then exit 2."""
+    sys.stderr.write(_format_usage(prog))
+    sys.stderr.write(f"{prog}: error: {message}\n")
+    sys.exit(2)
+
+
+def _expand_option(prog: str, arg: str) -> str:
+    """Expand a unique prefix of a long option, as argparse allows."""
+    option, eq, value = arg.partition("=")
+    if option in _LONG_OPTIONS:
+        return arg
+
+    matches = [name for name in _LONG_OPTIONS if name.startswith(option)]
+    if len(matches) > 1:
+        _usage_error(prog, f"ambiguous option: {arg} could match {', '.join(matches)}")
+    if matches:
+        return matches[0] + eq + value
+    return arg
+
+
+def parse_args(argv: list) -> tuple:
+    """Parse command-line arguments into (name, path, pattern).
+
+    A hand-rolled parser for the single positional and two options; it mirrors
+    argparse's help, error messages and exit codes without importing it.
+    """
+    prog = os.path.basename(sys.argv[0])
+    name = None
+    path = _DEFAULT_AGENT_DIR
+    pattern = "specialist"
+    extras = []
+
+    # Like argparse, resolve option prefixes (and report ambiguous ones) for
+    # everything before "--" before acting on any argument
+    end = argv.index("--") if "--" in argv else len(argv)
+    argv = [
+        _expand_option(prog, arg) if arg.startswith("--") else arg
+        for arg in argv[:end]
+    ] + argv[end:]
+
+    options_done = False
+
+    args = iter(argv)
+    for arg in args:
+        # After "--" and for a lone "-", the argument is always positional
+        if options_done or arg == "-" or not arg.startswith("-"):
+            if name is None:
+                name = arg
+            else:
+                extras.append(arg)
+            continue
+
+        if arg == "--":
+            options_done = True
+            continue
+
+        if arg in ("-h", "--help"):
+            print(_format_usage(prog) + _HELP_BODY, end="")
+            sys.exit(0)
+
+        option, eq, value = arg.partition("=")
+        if option == "--help":
+            _usage_error(prog, f"argument -h/--help: ignored explicit argument {value!r}")
+        if option in ("--path", "--pattern"):
+            if not eq:
+                value = next(args, None)
+                if value is None or (value.startswith("-") and value != "-"):
+                    _usage_error(prog, f"argument {option}: expected one argument")
+            if option == "--path":
+                path = Path(value)
+            elif value in TEMPLATES:
+                pattern = value
+            else:
+                _usage_error(
+                    prog,
+                    f"argument --pattern: invalid choice: {value!r} (choose from {_PATTERN_CHOICES})"
+                )
+        else:
+            extras.append(arg)
+
+    if name is None:
+        _usage_error(prog, "the following arguments are required: name")
+    if extras:
+        _usage_error(prog, f"unrecognized arguments: {' '.join(extras)}")
+
+    return name, path, pattern
+
+
+def main():
+    name, path, pattern = parse_args(sys.argv[1:])
+
+    agent_file = create_agent(name, path, pattern)
 
     print(f"Created agent: {agent_file}")
-    print(f"Pattern: {args.pattern}")
+    print(f"Pattern: {pattern}")
     print()
     print("Next steps:")
     print(f"  1. Edit {agent_file}")
@@ -310,7 +535,7 @@ Patterns:
     print("  4. Adjust tools and model as needed")
     print()
     print("Test your agent:")
-    print(f"  claude --agent {args.name}")
+    print(f"  claude --agent {name}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,365 @@
+"""Tests for init_agent.py"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import init_agent
+from init_agent import parse_args, validate_name
+
+
+class TestValidateName:
+    """Test agent name validation."""
+
+    @pytest.mark.parametrize("name", ["a", "a-1", "code-reviewer", "a1b2-", "z--z"])
+    def test_valid_names(self, name):
+        """Test lowercase names with digits and hyphens are accepted."""
+        assert validate_name(name) is True
+
+    @pytest.mark.parametrize("name", [
+        "",
+        "1a",
+        "-a",
+        "Abc",
+        "aBc",
+        "a_b",
+        "a b",
+        "a.b",
+        "a?",
+        "aé",
+        "é",
+        "\uff41",  # fullwidth "a"
+        "a\u00b2",  # superscript two
+        "abc\n",
+        "a\x00",
+    ])
+    def test_invalid_names(self, name):
+        """Test everything outside [a-z][a-z0-9-]* is rejected."""
+        assert not validate_name(name)
+
+
+class TestParseArgs:
+    """Test the hand-rolled command-line parser."""
+
+    def assert_usage_error(self, argv, message, capsys):
+        """Assert argv exits 2 with usage and the given error on stderr."""
+        with pytest.raises(SystemExit) as exc_info:
+            parse_args(argv)
+
+        assert exc_info.value.code == 2
+        captured = capsys.readouterr()
+        assert captured.err.startswith("usage: ")
+        assert f"error: {message}" in captured.err
+
+    def test_defaults(self):
+        """Test name only uses the default path and pattern."""
+        name, path, pattern = parse_args(["my-agent"])
+
+        assert name == "my-agent"
+        assert path == init_agent._DEFAULT_AGENT_DIR
+        assert pattern == "specialist"
+
+    def test_separate_option_values(self):
+        """Test --path and --pattern with separate values."""
+        assert parse_args(["x", "--path", "agents", "--pattern", "quick"]) == (
+            "x", Path("agents"), "quick"
+        )
+
+    def test_equals_option_values(self):
+        """Test --opt=value form."""
+        assert parse_args(["--path=agents", "--pattern=planner", "x"]) == (
+            "x", Path("agents"), "planner"
+        )
+
+    def test_lone_dash_is_a_value(self):
+        """Test a lone '-' is accepted as an option value."""
+        assert parse_args(["x", "--path", "-"]) == ("x", Path("-"), "specialist")
+
+    def test_double_dash_ends_options(self):
+        """Test arguments after '--' are positional."""
+        assert parse_args(["--pattern", "quick", "--", "x"]) == (
+            "x", init_agent._DEFAULT_AGENT_DIR, "quick"
+        )
+
+    def test_double_dash_extra_arguments(self, capsys):
+        """Test options after '--' are reported as unrecognized."""
+        self.assert_usage_error(
+            ["x", "--", "--pattern", "quick"],
+            "unrecognized arguments: --pattern quick",
+            capsys
+        )
+
+    @pytest.mark.parametrize("argv", [["-h"], ["--help"], ["x", "--path", "p", "-h"]])
+    def test_help(self, argv, capsys):
+        """Test -h/--help prints help and exits 0."""
+        with pytest.raises(SystemExit) as exc_info:
+            parse_args(argv)
+
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        assert out.startswith("usage: ")
+        assert "Patterns:" in out
+
+    def test_help_lists_pattern_choices(self, capsys):
+        """Test help shows the pattern choices in usage and options."""
+        with pytest.raises(SystemExit):
+            parse_args(["--help"])
+
+        out = capsys.readouterr().out
+        choices = "{researcher,reviewer,specialist,builder,quick,orchestrator,planner}"
+        assert f"[--pattern {choices}]" in out.splitlines()[1]
+        assert f"  --pattern {choices}\n" in out
+
+    @pytest.mark.parametrize("argv,expected", [
+        (["x", "--patt", "quick"], ("x", init_agent._DEFAULT_AGENT_DIR, "quick")),
+        (["x", "--patte=quick"], ("x", init_agent._DEFAULT_AGENT_DIR, "quick")),
+        (["x", "--path=", "--pattern", "quick"], ("x", Path(""), "quick")),
+        (["--pattern", "quick", "--", "x"], ("x", init_agent._DEFAULT_AGENT_DIR, "quick")),
+    ])
+    def test_option_prefixes(self, argv, expected):
+        """Test unique long-option prefixes are expanded."""
+        assert parse_args(argv) == expected
+
+    def test_help_prefix(self, capsys):
+        """Test a unique prefix of --help prints help."""
+        with pytest.raises(SystemExit) as exc_info:
+            parse_args(["--he"])
+
+        assert exc_info.value.code == 0
+        assert "Patterns:" in capsys.readouterr().out
+
+    @pytest.mark.parametrize("arg", ["--pa", "--pat=quick", "--p"])
+    def test_ambiguous_option(self, arg, capsys):
+        """Test an ambiguous prefix is reported before other arguments."""
+        self.assert_usage_error(
+            ["-h", "x", arg],
+            f"ambiguous option: {arg} could match --path, --pattern",
+            capsys
+        )
+
+    def test_help_with_explicit_argument(self, capsys):
+        """Test --help=value is rejected like argparse."""
+        self.assert_usage_error(
+            ["x", "--help=3"],
+            "argument -h/--help: ignored explicit argument '3'",
+            capsys
+        )
+
+    def test_missing_name(self, capsys):
+        """Test missing positional name."""
+        self.assert_usage_error(
+            ["--pattern", "quick"],
+            "the following arguments are required: name",
+            capsys
+        )
+
+    @pytest.mark.parametrize("argv,option", [
+        (["x", "--path"], "--path"),
+        (["x", "--pattern"], "--pattern"),
+        (["x", "--path", "--pattern", "quick"], "--path"),
+        (["x", "--pattern", "--"], "--pattern"),
+    ])
+    def test_missing_option_value(self, argv, option, capsys):
+        """Test an option without a value."""
+        self.assert_usage_error(argv, f"argument {option}: expected one argument", capsys)
+
+    def test_invalid_pattern(self, capsys):
+        """Test an unknown --pattern choice."""
+        self.assert_usage_error(
+            ["x", "--pattern", "nope"],
+            "argument --pattern: invalid choice: 'nope' (choose from 'researcher',",
+            capsys
+        )
+
+    def test_unrecognized_arguments(self, capsys):
+        """Test extra positionals and unknown options."""
+        self.assert_usage_error(
+            ["x", "y", "-q"],
+            "unrecognized arguments: y -q",
+            capsys
+        )
+
+
+class TestCreateAgent:
+    """Test single agent creation and the generated file."""
+
+    def test_quick_pattern_content(self, tmp_path):
+        """Test the full generated file for the quick pattern."""
+        agent_file = init_agent.create_agent("quick-search", tmp_path, "quick")
+
+        assert agent_file == tmp_path / "quick-search.md"
+        assert agent_file.read_bytes() == (
+            b"---\n"
+            b"name: quick-search\n"
+            b'description: "TODO: Describe when to use this agent"\n'
+            b"tools:\n"
+            b"  - Read\n"
+            b"  - Grep\n"
+            b"  - Glob\n"
+            b"model: haiku\n"
+            b"---\n"
+            b"\n"
+            b"You are a fast, efficient assistant for quick tasks.\n"
+            b"\n"
+            b"## Focus\n"
+            b"\n"
+            b"- Concise answers\n"
+            b"- Direct solutions\n"
+            b"- Fast turnaround\n"
+            b"- No over-explanation\n"
+            b"\n"
+            b"Keep responses brief. Get to the point immediately.\n"
+        )
+
+    @pytest.mark.parametrize("pattern", list(init_agent.TEMPLATES))
+    def test_every_pattern_matches_frontmatter_layout(self, pattern, tmp_path):
+        """Test each pattern renders the frontmatter and prompt layout."""
+        template = init_agent.TEMPLATES[pattern]
+        tools_yaml = "\n".join(f"  - {tool}" for tool in template["tools"])
+        expected = f'''---
+name: my-agent
+description: "TODO: Describe when to use this agent"
+tools:
+{tools_yaml}
+model: {template["model"]}
+---
+
+{template["prompt"]}
+'''
+
+        agent_file = init_agent.create_agent("my-agent", tmp_path, pattern)
+
+        content = agent_file.read_text(encoding="utf-8")
+        assert content == expected
+        assert content.endswith("\n") and not content.endswith("\n\n")
+
+    def test_removed_directory_is_recreated(self, tmp_path):
+        """Test a cached directory removed between calls is created again."""
+        agents_dir = tmp_path / "agents"
+        init_agent.create_agent("a", agents_dir, "quick")
+        (agents_dir / "a.md").unlink()
+        agents_dir.rmdir()
+
+        assert init_agent.create_agent("b", agents_dir, "quick").exists()
+
+    def test_recreate_failure_is_not_reported_as_existing_agent(
+        self, tmp_path, monkeypatch, capsys
+    ):
+        """Test a file in place of the directory surfaces the mkdir error."""
+        agents_dir = tmp_path / "agents"
+        init_agent.create_agent("a", agents_dir, "quick")
+        real_open = init_agent.os.open
+
+        def vanish_then_open(path, *args):
+            # The directory is swapped for a regular file just before the open
+            (agents_dir / "a.md").unlink()
+            agents_dir.rmdir()
+            agents_dir.write_text("not a directory")
+            monkeypatch.setattr(init_agent.os, "open", real_open)
+            raise FileNotFoundError(path)
+
+        monkeypatch.setattr(init_agent.os, "open", vanish_then_open)
+
+        with pytest.raises(FileExistsError):
+            init_agent.create_agent("b", agents_dir, "quick")
+
+        assert "already exists" not in capsys.readouterr().out
+
+
+class TestCreateAgents:
+    """Test batch agent creation."""
+
+    def test_creates_all_agents(self, tmp_path):
+        """Test every spec is written, across directories."""
+        first = tmp_path / "first"
+        second = tmp_path / "nested" / "second"
+
+        created = init_agent.create_agents([
+            ("a", first, "quick"),
+            ("b", second, "planner"),
+            ("c", first, "builder"),
+        ])
+
+        assert created == [first / "a.md", second / "b.md", first / "c.md"]
+        content = (second / "b.md").read_text()
+        assert content.startswith("---\nname: b\n")
+        assert "model: opus\n" in content
+
+    def test_duplicate_in_batch_writes_nothing(self, tmp_path, capsys):
+        """Test a repeated (name, path) target is rejected before writing."""
+        with pytest.raises(SystemExit) as exc_info:
+            init_agent.create_agents([
+                ("a", tmp_path, "quick"),
+                ("b", tmp_path, "quick"),
+                ("a", tmp_path, "quick"),
+            ])
+
+        assert exc_info.value.code == 1
+        assert "Duplicate agent in batch" in capsys.readouterr().out
+        assert list(tmp_path.iterdir()) == []
+
+    def test_invalid_name_writes_nothing(self, tmp_path, capsys):
+        """Test an invalid name late in the batch stops every write."""
+        with pytest.raises(SystemExit) as exc_info:
+            init_agent.create_agents([
+                ("a", tmp_path, "quick"),
+                ("Bad", tmp_path, "quick"),
+            ])
+
+        assert exc_info.value.code == 1
+        assert "must be lowercase" in capsys.readouterr().out
+        assert list(tmp_path.iterdir()) == []
+
+    def test_existing_file_writes_nothing(self, tmp_path, capsys):
+        """Test an existing target file is reported before writing."""
+        (tmp_path / "b.md").write_text("keep")
+
+        with pytest.raises(SystemExit):
+            init_agent.create_agents([
+                ("a", tmp_path, "quick"),
+                ("b", tmp_path, "quick"),
+            ])
+
+        assert "already exists" in capsys.readouterr().out
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["b.md"]
+        assert (tmp_path / "b.md").read_text() == "keep"
+
+    def test_failed_write_removes_created_files(self, tmp_path, monkeypatch):
+        """Test files from this batch are removed if a later write fails."""
+        (tmp_path / "b.md").write_text("keep")
+        # Simulate the file appearing between the checks and the write
+        monkeypatch.setattr(init_agent.os.path, "lexists", lambda path: False)
+
+        with pytest.raises(SystemExit):
+            init_agent.create_agents([
+                ("a", tmp_path, "quick"),
+                ("b", tmp_path, "quick"),
+            ])
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["b.md"]
+        assert (tmp_path / "b.md").read_text() == "keep"
+
+    def test_failed_os_write_removes_all_files(self, tmp_path, monkeypatch):
+        """Test a write error mid-batch leaves no files, including the failing one."""
+        real_write = init_agent.os.write
+        calls = []
+
+        def failing_write(fd, data):
+            calls.append(fd)
+            if len(calls) == 2:
+                raise OSError(28, "No space left on device")
+            return real_write(fd, data)
+
+        monkeypatch.setattr(init_agent.os, "write", failing_write)
+
+        with pytest.raises(OSError):
+            init_agent.create_agents([
+                ("a", tmp_path, "quick"),
+                ("b", tmp_path, "quick"),
+            ])
+
+        assert list(tmp_path.iterdir()) == []